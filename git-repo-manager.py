@@ -14,10 +14,16 @@ This script automatically manages GitHub repositories by:
   - Ensuring GitHub authentication via `gh auth login` and `ssh -T git@github.com`.
   - Cloning missing repositories and pulling the latest changes for existing ones.
   - Ignoring `.DS_Store` files globally.
-  - Providing interactive options for committing and pushing changes before pulling.
+  - Offering a single interactive prompt for committing and pushing changes before pulling.
+  - Caching the repository list, auth checks and username under `~/.cache/git-repo-manager`.
 
 Options:
-  - No options required; the script automatically detects OS and installs dependencies.
+  --shallow       Clone new repositories with `--depth=1 --single-branch` (no history).
+  --auto-commit   Commit & push uncommitted changes in every repo without asking.
+  --skip-dirty    Leave uncommitted changes alone without asking.
+
+  No options are required; the script automatically detects OS and installs dependencies.
+  New repositories are cloned blobless (`--filter=blob:none`), fetching file contents on demand.
 
 Supported Platforms:
   - macOS (Homebrew)
@@ -33,29 +39,124 @@ Before running this script:
      $ python3 git-repo-manager.py
 """
 
+import argparse
+import asyncio
+import functools
+import itertools
+import json
 import os
+import shlex
+import shutil
+import stat
 import subprocess
 import sys
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 # Define the directory where repositories will be stored
 CLONE_DIR = os.path.expanduser("~/git")
 
+# Upper bound on concurrent clone/pull operations
+MAX_WORKERS = 16
+
+# winget package IDs for the dependencies
+WINGET_IDS = {"git": "Git.Git", "gh": "GitHub.cli"}
+
+# Local cache for GitHub API results between runs
+CACHE_DIR = os.path.expanduser("~/.cache/git-repo-manager")
+REPO_CACHE_TTL = 10 * 60  # seconds
+AUTH_CACHE_TTL = 60 * 60  # seconds
+USER_CACHE_TTL = 24 * 60 * 60  # seconds
+
+# Error output that suggests expired or rejected credentials rather than an ordinary failure
+AUTH_FAILURE_MARKERS = (
+    "Permission denied (publickey",
+    "Host key verification failed",
+    "Authentication failed",
+    "Bad credentials",
+    "HTTP 401",
+    "gh auth login",
+)
+
+# SSH connection sharing for github.com, managed between these markers in ~/.ssh/config
+SSH_CONFIG_BEGIN = "# BEGIN git-repo-manager"
+SSH_CONFIG_END = "# END git-repo-manager"
+SSH_MULTIPLEX_BLOCK = """Host github.com
+  ControlMaster auto
+  ControlPersist 5m
+  ControlPath ~/.ssh/cm-%C"""
+
+# Owned repositories, one page per request; `gh api --paginate` fills in $endCursor
+REPO_LIST_QUERY = """
+query($owner: String!, $endCursor: String) {
+  repositoryOwner(login: $owner) {
+    repositories(first: 100, after: $endCursor, ownerAffiliations: OWNER) {
+      nodes { name sshUrl }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
+
+# Everything the sync needs to know about a local clone, read from one `git status` call
+DETACHED_HEAD = "(detached)"  # `branch.head` value when no branch is checked out
+RepoStatus = namedtuple("RepoStatus", ["branch", "head", "changes"])
+
+# Set once `gh auth status` has succeeded in this process
+_github_authenticated = False
+
 ###############################################################################
 # Utility Functions                                                           #
 ###############################################################################
 
-def run_command(cmd, check=False, capture_output=False):
-    """Executes a shell command safely."""
+def run_command(cmd, check=False, capture_output=False, shell=False):
+    """Executes a command safely. Strings are split into argv unless `shell=True`."""
+    if isinstance(cmd, str) and not shell:
+        cmd = shlex.split(cmd)
     try:
         if capture_output:
-            result = subprocess.run(cmd, shell=True, check=check, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            result = subprocess.run(cmd, shell=shell, check=check, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
             return result.stdout.strip()
         else:
-            subprocess.run(cmd, shell=True, check=check)
-    except subprocess.CalledProcessError as e:
+            subprocess.run(cmd, shell=shell, check=check)
+    except (subprocess.CalledProcessError, OSError) as e:
         print(f"❌ Command failed: {cmd}\nError: {e}")
         sys.exit(1)
 
+async def run_command_async(cmd):
+    """Runs an argv command without blocking the event loop. Returns `(returncode, stdout, stderr)`."""
+    proc = await asyncio.create_subprocess_exec(*cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stdout, stderr = await proc.communicate()
+    return proc.returncode, stdout.decode().strip(), stderr.decode().strip()
+
+def read_cache(filename):
+    """Loads a JSON cache file from CACHE_DIR, returning {} if missing or unreadable."""
+    try:
+        with open(os.path.join(CACHE_DIR, filename)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def write_file_atomic(path, content, mode=0o600):
+    """Replaces `path` with `content` via a temp file, so readers never see a partial file."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.")
+    try:
+        with open(fd, "w") as f:
+            f.write(content)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def write_cache(filename, data):
+    """Atomically writes a JSON cache file to CACHE_DIR."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    write_file_atomic(os.path.join(CACHE_DIR, filename), json.dumps(data))
+
+@functools.lru_cache(maxsize=1)
 def detect_os():
     """Detects the operating system and package manager."""
     if sys.platform.startswith("linux"):
@@ -78,36 +179,43 @@ def detect_os():
 # Dependency Management                                                       #
 ###############################################################################
 
-def install_package(package):
-    """Installs a package using the appropriate package manager."""
+def install_packages(packages):
+    """Installs all given packages in one pass of the appropriate package manager."""
     os_type = detect_os()
-    print(f"🔧 Installing {package}...")
+    print(f"🔧 Installing {', '.join(packages)}...")
 
     if os_type == "linux-apt":
-        run_command(f"sudo apt update -y && sudo apt install -y {package}")
+        run_command(["sudo", "apt", "update", "-y"], check=True)
+        run_command(["sudo", "apt", "install", "-y", *packages])
     elif os_type == "linux-dnf":
-        run_command(f"sudo dnf install -y {package}")
+        run_command(["sudo", "dnf", "install", "-y", *packages])
     elif os_type == "linux-yum":
-        run_command(f"sudo yum install -y {package}")
+        run_command(["sudo", "yum", "install", "-y", *packages])
     elif os_type == "macos":
-        run_command(f"brew install {package}")
+        run_command(["brew", "install", *packages])
     elif os_type == "windows":
-        if package == "git":
-            run_command("winget install --id Git.Git --silent") or run_command("choco install git -y")
-        elif package == "gh":
-            run_command("winget install --id GitHub.cli --silent") or run_command("choco install gh -y")
+        # Prefer winget; fall back to Chocolatey if it is missing or any install fails
+        if shutil.which("winget") and all(
+            subprocess.call(["winget", "install", "--id", WINGET_IDS[package], "--silent"]) == 0 for package in packages
+        ):
+            return
+        run_command(["choco", "install", *packages, "-y"])
     else:
-        print(f"⚠️ Unsupported OS: {os_type}. Install {package} manually.")
+        print(f"⚠️ Unsupported OS: {os_type}. Install {', '.join(packages)} manually.")
         sys.exit(1)
 
 def ensure_dependencies():
     """Ensures Git and GitHub CLI are installed."""
+    missing = []
     for package in ["git", "gh"]:
-        if subprocess.call(["which", package], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) != 0:
-            install_package(package)
+        if shutil.which(package) is None:
+            missing.append(package)
         else:
             print(f"✅ {package} is already installed.")
 
+    if missing:
+        install_packages(missing)
+
 ###############################################################################
 # Authentication & Setup                                                      #
 ###############################################################################
@@ -119,40 +227,175 @@ def configure_global_gitignore():
     # Check if .gitignore_global exists, create if necessary
     if not os.path.exists(global_gitignore):
         print("📁 Creating global .gitignore file...")
-        run_command(f"touch {global_gitignore}")
+        open(global_gitignore, "a").close()
 
     # Ensure .DS_Store is ignored
-    run_command(f'grep -qxF ".DS_Store" {global_gitignore} || echo ".DS_Store" >> {global_gitignore}')
+    with open(global_gitignore) as f:
+        content = f.read()
+    if ".DS_Store" not in content.splitlines():
+        with open(global_gitignore, "a") as f:
+            f.write(("" if not content or content.endswith("\n") else "\n") + ".DS_Store\n")
     
     # Set it as the global ignore file
-    run_command("git config --global core.excludesfile ~/.gitignore_global")
+    run_command(["git", "config", "--global", "core.excludesfile", "~/.gitignore_global"])
 
     print("✅ .DS_Store is now globally ignored in Git.")
 
-def authenticate_github():
-    """Ensures the user is authenticated with GitHub CLI."""
-    if subprocess.call(["gh", "auth", "status"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) != 0:
+def auth_recently_verified(key):
+    """Returns True if the `key` check (e.g. "gh_ok_at") succeeded within AUTH_CACHE_TTL."""
+    return time.time() - read_cache("auth.json").get(key, 0) < AUTH_CACHE_TTL
+
+def record_auth_success(key):
+    """Remembers that the `key` check succeeded just now."""
+    cache = read_cache("auth.json")
+    cache[key] = time.time()
+    write_cache("auth.json", cache)
+
+def invalidate_auth_cache():
+    """Forgets all successful auth checks so the next run verifies them again."""
+    cache = read_cache("auth.json")
+    for key in ("gh_ok_at", "ssh_ok_at"):
+        cache.pop(key, None)
+    write_cache("auth.json", cache)
+
+def note_auth_failure(output):
+    """Invalidates the auth cache if `output` looks like a credential problem."""
+    if any(marker in output for marker in AUTH_FAILURE_MARKERS):
+        invalidate_auth_cache()
+
+async def authenticate_github():
+    """
+    Checks GitHub CLI authentication without prompting. Skipped if verified recently.
+
+    Returns False if `gh auth login` is still needed; see `login_github`.
+    """
+    global _github_authenticated
+    if _github_authenticated:
+        return True
+
+    if auth_recently_verified("gh_ok_at"):
+        print("✅ GitHub authentication was verified recently.")
+        _github_authenticated = True
+        return True
+
+    returncode, _, _ = await run_command_async(["gh", "auth", "status"])
+    if returncode != 0:
         print("🔑 GitHub CLI authentication required.")
-        run_command("gh auth login")
+        return False
+
+    print("✅ GitHub authentication is already set up.")
+    _github_authenticated = True
+    record_auth_success("gh_ok_at")
+    return True
+
+def login_github():
+    """Runs the interactive `gh auth login` and forgets the cached username, which may belong to another account."""
+    global _github_authenticated
+    run_command(["gh", "auth", "login"], check=True)
+    _github_authenticated = True
+
+    cache = read_cache("auth.json")
+    cache.pop("username", None)
+    cache.pop("username_at", None)
+    cache["gh_ok_at"] = time.time()
+    write_cache("auth.json", cache)
+
+def configure_ssh_multiplexing():
+    """Lets all SSH connections to github.com share one master connection."""
+    if detect_os() == "windows":
+        return  # Windows OpenSSH does not support ControlMaster
+
+    # Follow a symlinked config (e.g. from a dotfiles checkout) so the link itself survives
+    ssh_config = os.path.realpath(os.path.expanduser("~/.ssh/config"))
+    managed_block = f"{SSH_CONFIG_BEGIN}\n{SSH_MULTIPLEX_BLOCK}\n{SSH_CONFIG_END}\n"
+    try:
+        with open(ssh_config) as f:
+            content = f.read()
+    except FileNotFoundError:
+        content = ""
+
+    if managed_block in content:
+        return
+
+    # Replace a block written by an earlier version, otherwise append a new one
+    if SSH_CONFIG_BEGIN in content and SSH_CONFIG_END in content:
+        start = content.index(SSH_CONFIG_BEGIN)
+        end = content.index(SSH_CONFIG_END) + len(SSH_CONFIG_END) + 1
+        content = content[:start] + managed_block + content[end:]
     else:
-        print("✅ GitHub authentication is already set up.")
+        content += f"\n{managed_block}" if content else managed_block
+
+    os.makedirs(os.path.dirname(ssh_config), mode=0o700, exist_ok=True)
+    mode = stat.S_IMODE(os.stat(ssh_config).st_mode) if os.path.exists(ssh_config) else 0o600
+    write_file_atomic(ssh_config, content, mode)
+    print("✅ Enabled SSH connection sharing for github.com.")
+
+async def ensure_ssh_master():
+    """
+    Starts a background SSH master for github.com unless one is already running.
+
+    The master gets no stdio at all, so no captured command (the `ssh -T` probe,
+    `git ls-remote`, ...) ever becomes the master and waits on its open stderr for
+    the whole `ControlPersist` period; they all connect as mux clients instead.
+    """
+    if detect_os() == "windows":
+        return  # Windows OpenSSH does not support ControlMaster
+
+    devnull = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+    check = await asyncio.create_subprocess_exec("ssh", "-O", "check", "git@github.com", **devnull)
+    if await check.wait() == 0:
+        return
+
+    # -f backgrounds only after authentication, so the master is usable once this returns
+    master = await asyncio.create_subprocess_exec("ssh", "-fNM", "git@github.com", **devnull)
+    await master.wait()
+
+async def check_ssh_access():
+    """
+    Verifies SSH authentication with GitHub.
+
+    SSH multiplexing is enabled first (`ControlMaster auto` for github.com) and a
+    dedicated master connection is ensured on every run, even when the probe itself
+    is skipped because it succeeded recently. The probe and every later clone/pull
+    reuse it instead of paying for their own TCP + SSH handshake, and
+    `ControlPersist 5m` keeps it alive for the whole run.
+    """
+    configure_ssh_multiplexing()
+    # Needed even when the probe is skipped: the last run's master may have expired
+    await ensure_ssh_master()
+    if auth_recently_verified("ssh_ok_at"):
+        print("✅ SSH authentication with GitHub was verified recently.")
+        return
 
-def check_ssh_access():
-    """Verifies SSH authentication with GitHub."""
     print("🔍 Checking SSH access to GitHub...")
     
-    result = subprocess.run(["ssh", "-T", "git@github.com"], capture_output=True, text=True)
-    ssh_output = (result.stdout + result.stderr).strip()
+    _, stdout, stderr = await run_command_async(["ssh", "-T", "git@github.com"])
+    ssh_output = (stdout + stderr).strip()
     
     if "successfully authenticated" in ssh_output or "does not provide shell access" in ssh_output:
         print("✅ SSH authentication with GitHub is working.")
+        record_auth_success("ssh_ok_at")
     else:
         print(f"⚠️ SSH authentication failed. Full output:\n{ssh_output}")
         sys.exit(1)
 
-def get_github_user():
-    """Retrieves the GitHub username from GitHub CLI."""
-    username = run_command("gh api user --jq .login", capture_output=True)
+async def get_github_user():
+    """Retrieves the GitHub username from GitHub CLI (cached), or None if it cannot answer."""
+    cache = read_cache("auth.json")
+    if cache.get("username") and time.time() - cache.get("username_at", 0) < USER_CACHE_TTL:
+        return cache["username"]
+
+    _, username, _ = await run_command_async(["gh", "api", "user", "--jq", ".login"])
+    if username:
+        cache = read_cache("auth.json")
+        cache.update(username=username, username_at=time.time())
+        write_cache("auth.json", cache)
+        return username
+    return None
+
+def prompt_github_user():
+    """Falls back to $GITHUB_USER, then `git config github.user`, before prompting for the username."""
+    username = os.environ.get("GITHUB_USER") or run_command(["git", "config", "github.user"], capture_output=True)
     return username if username else input("Enter your GitHub username: ").strip()
 
 ###############################################################################
@@ -160,63 +403,258 @@ def get_github_user():
 ###############################################################################
 
 def fetch_repos(username):
-    """Fetches all repositories from GitHub."""
+    """
+    Returns an iterable of `(name, ssh_url)` pairs for all of the user's repositories.
+
+    A recent on-disk copy is returned as a list. Otherwise the listing is streamed
+    page by page, so cloning can start before the last page has arrived.
+    """
+    cache = read_cache("repos.json")
+    entry = cache.get(username)
+    if entry and time.time() - entry["fetched_at"] < REPO_CACHE_TTL:
+        print(f"📦 Using cached repository list for {username}.")
+        return [tuple(repo) for repo in entry["repos"]]
+
+    return _stream_repos(username, cache)
+
+def _stream_repos(username, cache):
+    """Yields repositories as `gh` prints them, then caches the complete list. Exits non-zero if `gh` fails."""
     print(f"📡 Fetching repository list for {username}...")
-    repo_data = run_command(f"gh repo list {username} --json name,url --jq '.[] | \"\(.name) \(.url)\"'", capture_output=True)
+    cmd = [
+        "gh", "api", "graphql", "--paginate",
+        "-f", f"owner={username}",
+        "-f", f"query={REPO_LIST_QUERY}",
+        "--jq", ".data.repositoryOwner.repositories.nodes[] | tojson",
+    ]
+
+    repos = []
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True) as proc:
+        for line in proc.stdout:
+            repo = json.loads(line)
+            repos.append((repo["name"], repo["sshUrl"]))
+            yield repos[-1]
+        errors = proc.stderr.read().strip()
+
+    if proc.returncode != 0:
+        print(f"❌ Repository listing failed.\n{errors}".rstrip())
+        note_auth_failure(errors)
+        sys.exit(1)
+    if not repos:
+        print("❌ No repositories found.")
+        return
+
+    cache[username] = {"fetched_at": time.time(), "repos": repos}
+    write_cache("repos.json", cache)
+
+def list_local_repos():
+    """Returns the names of Git working trees in CLONE_DIR from a single directory scan."""
+    with os.scandir(CLONE_DIR) as entries:
+        return {entry.name for entry in entries if entry.is_dir() and os.path.exists(os.path.join(entry.path, ".git"))}
+
+def _short_status(entry):
+    """Converts a porcelain v2 entry to the `git status --short` form, e.g. " M path"."""
+    kind = entry[0]
+    if kind in "?!":
+        return f"{kind * 2} {entry[2:]}"
+
+    # Ordinary (1), renamed/copied (2) and unmerged (u) entries have 8, 9 and 10 fields before the path
+    fields = entry.split(" ", {"1": 8, "2": 9, "u": 10}[kind])
+    xy, path = fields[1].replace(".", " "), fields[-1]
+    if kind == "2":
+        new_path, orig_path = path.split("\t", 1)
+        path = f"{orig_path} -> {new_path}"
+    return f"{xy} {path}"
+
+def get_repo_status(repo_path):
+    """
+    Returns a RepoStatus for a repo from a single `git status` call, ignoring `.DS_Store`.
+    If `git status` fails, the RepoStatus has no branch.
+
+    The porcelain v2 branch headers carry the current branch and HEAD commit, so no
+    further `git rev-parse` processes are needed per repo.
+    """
+    result = subprocess.run(["git", "-C", repo_path, "status", "--porcelain=v2", "--branch"], capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"⚠️ Could not read status of {repo_path}:\n{result.stderr.strip()}")
+        return RepoStatus(None, None, "")
+
+    branch, head, changes = None, None, []
+    for line in result.stdout.splitlines():
+        if line.startswith("# branch.head "):
+            branch = line[len("# branch.head "):]
+        elif line.startswith("# branch.oid "):
+            head = line[len("# branch.oid "):]
+        elif not line.startswith("#"):
+            change = _short_status(line)
+            if ".DS_Store" not in change:
+                changes.append(change)
+
+    return RepoStatus(branch, head, "\n".join(changes))
+
+def run_git_remote(cmd):
+    """
+    Runs a git command that talks to the remote, echoing its stderr. Returns True on success.
+
+    Failures that look like rejected credentials clear the auth cache.
+    """
+    result = subprocess.run(cmd, stderr=subprocess.PIPE, text=True)
+    if result.stderr.strip():
+        print(result.stderr.strip())
+    if result.returncode != 0:
+        print(f"❌ Command failed: {cmd}")
+        note_auth_failure(result.stderr)
+        return False
+    return True
+
+def _sync_one(repo_name, repo_url, status=None, shallow=False):
+    """Pulls an existing repository (given its RepoStatus) or clones a missing one. Safe to run in a worker thread."""
+    repo_path = os.path.join(CLONE_DIR, repo_name)
+
+    if status is not None:
+        if status.branch is None:
+            print(f"⏭️ Skipping {repo_name}: its Git status could not be read.")
+            return
+        if status.branch == DETACHED_HEAD:
+            print(f"⏭️ Skipping {repo_name}: HEAD is detached, no branch to pull.")
+            return
+
+        # A ref advertisement is far cheaper than a pull when nothing has changed
+        remote = run_command(["git", "-C", repo_path, "ls-remote", "origin", f"refs/heads/{status.branch}"], capture_output=True)
+        if remote and remote.split()[0] == status.head:
+            print(f"✅ {repo_name} is already up to date.")
+            return
+
+        print(f"🔄 Updating existing repo: {repo_name}")
+        if not run_git_remote(["git", "-C", repo_path, "pull", "origin", status.branch]):
+            sys.exit(1)
+    else:
+        print(f"🚀 Cloning new repository: {repo_name}")
+        clone_opts = ["--depth=1", "--single-branch"] if shallow else ["--filter=blob:none"]
+        run_git_remote(["git", "clone", *clone_opts, repo_url, repo_path])
+
+def commit_local_changes(statuses, dirty_policy="ask"):
+    """
+    Commits & pushes uncommitted changes before any pulls start.
+
+    All dirty repos are listed up front and answered with one prompt, unless
+    `dirty_policy` is "commit" or "skip", in which case nothing is asked.
+    Entries in `statuses` are refreshed for every repo that gets pushed.
+    """
+    dirty = [(repo_name, status) for repo_name, status in statuses.items() if status.changes]
+    if not dirty:
+        return
+
+    for i, (repo_name, status) in enumerate(dirty, 1):
+        print(f"\n📝 [{i}] Uncommitted changes detected in {repo_name}:")
+        print(status.changes)
+
+    if dirty_policy == "commit":
+        selected = dirty
+    elif dirty_policy == "skip":
+        selected = []
+    else:
+        answer = input("\nCommit changes in which repos? (e.g. 1,3 / all / none): ").strip().lower()
+        if answer in ("all", "a", "y", "yes"):
+            selected = dirty
+        else:
+            picks = {int(token) for token in answer.replace(",", " ").split() if token.isdigit()}
+            selected = [repo for i, repo in enumerate(dirty, 1) if i in picks]
+
+    for repo_name, status in selected:
+        if status.branch == DETACHED_HEAD:
+            print(f"⏭️ Not committing in {repo_name}: HEAD is detached, no branch to push.")
+            continue
 
-    if not repo_data:
-        print("❌ No repositories found or API call failed.")
-        return []
+        repo_path = os.path.join(CLONE_DIR, repo_name)
+        run_command(["git", "-C", repo_path, "add", "."], check=True)
+        run_command(["git", "-C", repo_path, "commit", "-m", f"Auto-commit before pull: {repo_name}"], check=True)
+        if not run_git_remote(["git", "-C", repo_path, "push", "origin", status.branch]):
+            sys.exit(1)
 
-    return [line.strip().split() for line in repo_data.split("\n")]
+        # The new HEAD is what was just pushed, so the pull phase can see it is up to date
+        statuses[repo_name] = get_repo_status(repo_path)
 
-def clone_or_update_repos(repos):
+def clone_or_update_repos(repos, shallow=False, dirty_policy="ask"):
     """Clones missing repositories, commits & pushes local changes interactively, and updates existing ones."""
     os.makedirs(CLONE_DIR, exist_ok=True)
-    os.chdir(CLONE_DIR)
     print(f"📁 Using clone directory: {CLONE_DIR}")
 
-    run_command("git config --global pull.ff only")  # Set default pull strategy
+    run_command(["git", "config", "--global", "pull.ff", "only"])  # Set default pull strategy
+    run_command(["git", "config", "--global", "fetch.negotiationAlgorithm", "skipping"])  # Fewer negotiation round-trips
 
-    for repo_name, repo_url in repos:
-        repo_path = os.path.join(CLONE_DIR, repo_name)
+    # Clones and pulls are network-bound, so run them concurrently
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # New repositories start cloning while the rest of the list is still arriving
+        local_repos = list_local_repos()
+        futures, existing = [], []
+        for repo_name, repo_url in repos:
+            if repo_name in local_repos:
+                existing.append((repo_name, repo_url))
+            else:
+                futures.append(executor.submit(_sync_one, repo_name, repo_url, None, shallow))
 
-        if os.path.exists(repo_path) and os.path.isdir(repo_path) and os.path.exists(os.path.join(repo_path, ".git")):
-            print(f"\n🔄 Updating existing repo: {repo_name}")
-            os.chdir(repo_path)
+        for future in futures:
+            future.result()
 
-            # ✅ Check for uncommitted changes (excluding .DS_Store)
-            changes = run_command("git status --porcelain | grep -v .DS_Store", capture_output=True)
-            if changes:
-                print(f"\n📝 Uncommitted changes detected in {repo_name}:")
-                print(changes)
+        # One `git status` per existing repo yields its branch, HEAD and uncommitted changes
+        repo_paths = [os.path.join(CLONE_DIR, repo_name) for repo_name, _ in existing]
+        statuses = dict(zip((repo_name for repo_name, _ in existing), executor.map(get_repo_status, repo_paths)))
 
-                if input(f"Commit all changes in {repo_name}? (y/n): ").strip().lower() == "y":
-                    run_command("git add .")
-                    run_command(f'git commit -m "Auto-commit before pull: {repo_name}"')
-                    run_command("git push origin $(git rev-parse --abbrev-ref HEAD)", check=True)
+        # The single prompt happens once clones are done so it never interleaves with worker output
+        commit_local_changes(statuses, dirty_policy)
 
-            run_command("git pull origin $(git rev-parse --abbrev-ref HEAD)", check=True)
-
-        else:
-            print(f"🚀 Cloning new repository: {repo_name}")
-            run_command(f"git clone {repo_url} {repo_path}")
+        futures = [executor.submit(_sync_one, repo_name, repo_url, statuses[repo_name], shallow) for repo_name, repo_url in existing]
+        for future in futures:
+            future.result()
 
 ###############################################################################
 # Main Execution                                                              #
 ###############################################################################
 
+def parse_args():
+    """Parses command-line options."""
+    parser = argparse.ArgumentParser(description="Clone and update all of your GitHub repositories.")
+    parser.add_argument("--shallow", action="store_true", help="clone new repositories without history")
+    dirty = parser.add_mutually_exclusive_group()
+    dirty.add_argument("--auto-commit", dest="dirty_policy", action="store_const", const="commit", default="ask",
+                       help="commit & push uncommitted changes without asking")
+    dirty.add_argument("--skip-dirty", dest="dirty_policy", action="store_const", const="skip",
+                       help="leave uncommitted changes alone without asking")
+    return parser.parse_args()
+
+async def prepare_github():
+    """
+    Runs the non-interactive GitHub CLI and SSH probes concurrently.
+
+    Returns the GitHub username, or None if it is not known yet.
+    """
+    async def github_probe():
+        if not await authenticate_github():
+            return None
+        return await get_github_user()
+
+    username, _ = await asyncio.gather(github_probe(), check_ssh_access())
+    return username
+
 def main():
     """Main script execution."""
+    args = parse_args()
     ensure_dependencies()
     configure_global_gitignore()
-    authenticate_github()
-    check_ssh_access()
 
-    username = get_github_user()
-    repos = fetch_repos(username)
-    if repos:
-        clone_or_update_repos(repos)
+    username = asyncio.run(prepare_github())
+
+    # Interactive steps wait until the probes (and any SSH host-key prompt) are done with the terminal
+    if not _github_authenticated:
+        login_github()
+        username = asyncio.run(get_github_user())
+    if not username:
+        username = prompt_github_user()
+    # Wait for the first repository before touching CLONE_DIR or global git config
+    repos = iter(fetch_repos(username))
+    first = next(repos, None)
+    if first is not None:
+        clone_or_update_repos(itertools.chain([first], repos), shallow=args.shallow, dirty_policy=args.dirty_policy)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file